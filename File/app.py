@@ -1,12 +1,23 @@
 import streamlit as st
 import os
 import time
+import collections
+import functools
 import pandas as pd
 import psutil
 from pathlib import Path
 import platform
 import subprocess
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import attrgetter
+from datetime import datetime
+
+# Prefer moving files to the recycle bin so deletions can be undone
+try:
+    from send2trash import send2trash as _remove_file
+except ImportError:
+    _remove_file = os.remove
 
 from file_scanner import FileScanner
 from file_organizer import FileOrganizer
@@ -14,11 +25,7 @@ from file_monitor import FileMonitor
 import utils
 
 # Custom CSS for beautiful styling and theme toggle
-def load_css():
-    dark_theme = st.session_state.get('dark_theme', False)
-    
-    if dark_theme:
-        css = """
+_DARK_CSS = """
         <style>
         .stApp {
             background: linear-gradient(135deg, #1e1e1e 0%, #2d2d2d 100%);
@@ -59,8 +66,8 @@ def load_css():
         }
         </style>
         """
-    else:
-        css = """
+
+_LIGHT_CSS = """
         <style>
         .stApp {
             background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
@@ -98,6 +105,12 @@ def load_css():
             border-left: 4px solid #667eea;
             box-shadow: 0 2px 8px rgba(0,0,0,0.1);
         }
+        </style>
+        """
+
+# Only needed until the splash screen has been shown
+_SPLASH_CSS = """
+        <style>
         .splash-screen {
             position: fixed;
             top: 0;
@@ -115,8 +128,17 @@ def load_css():
         }
         </style>
         """
-    
-    st.markdown(css, unsafe_allow_html=True)
+
+@st.cache_data
+def _build_css(dark: bool, include_splash: bool) -> str:
+    """Return the stylesheet for the selected theme"""
+    css = _DARK_CSS if dark else _LIGHT_CSS
+    return css + _SPLASH_CSS if include_splash else css
+
+def load_css():
+    st.markdown(_build_css(st.session_state.get('dark_theme', False),
+                           not st.session_state.get('splash_shown', False)),
+                unsafe_allow_html=True)
 
 # Splash screen function
 def show_splash_screen():
@@ -124,32 +146,31 @@ def show_splash_screen():
         st.session_state.splash_shown = False
     
     if not st.session_state.splash_shown:
-        splash_placeholder = st.empty()
-        with splash_placeholder.container():
-            st.markdown("""
-            <div class="splash-screen">
-                <div style="text-align: center;">
-                    <h1>🤖 DupliFinder AI</h1>
-                    <p style="font-size: 1.5rem; margin-top: 1rem;">Intelligent File Duplicate Detection</p>
-                    <div style="margin-top: 2rem;">
-                        <div style="width: 50px; height: 50px; border: 5px solid #f3f3f3; border-top: 5px solid #ffffff; border-radius: 50%; animation: spin 2s linear infinite; margin: 0 auto;"></div>
-                    </div>
+        # The fade-out runs client-side so the script thread never blocks
+        st.markdown("""
+        <div class="splash-screen" style="animation: fadeout 0.5s ease 2s forwards;">
+            <div style="text-align: center;">
+                <h1>🤖 DupliFinder AI</h1>
+                <p style="font-size: 1.5rem; margin-top: 1rem;">Intelligent File Duplicate Detection</p>
+                <div style="margin-top: 2rem;">
+                    <div style="width: 50px; height: 50px; border: 5px solid #f3f3f3; border-top: 5px solid #ffffff; border-radius: 50%; animation: spin 2s linear infinite; margin: 0 auto;"></div>
                 </div>
             </div>
-            <style>
-            @keyframes spin {
-                0% { transform: rotate(0deg); }
-                100% { transform: rotate(360deg); }
-            }
-            </style>
-            """, unsafe_allow_html=True)
-        
-        time.sleep(2)
+        </div>
+        <style>
+        @keyframes spin {
+            0% { transform: rotate(0deg); }
+            100% { transform: rotate(360deg); }
+        }
+        @keyframes fadeout {
+            to { opacity: 0; visibility: hidden; pointer-events: none; }
+        }
+        </style>
+        """, unsafe_allow_html=True)
         st.session_state.splash_shown = True
-        splash_placeholder.empty()
-        st.rerun()
 
 # Get all available drives
+@st.cache_data(ttl=300)
 def get_all_drives():
     drives = []
     if platform.system() == "Windows":
@@ -159,6 +180,48 @@ def get_all_drives():
         drives = ["/"]
     return drives
 
+@st.cache_data(ttl=60)
+def get_drive_usage(drive):
+    """Return (used_percent, free_gb, total_gb) for a drive"""
+    usage = psutil.disk_usage(drive)
+    free_space = usage.free / (1024**3)  # Convert to GB
+    total_space = usage.total / (1024**3)
+    used_percent = (usage.used / usage.total) * 100
+    return used_percent, free_space, total_space
+
+# Cached scanning; dir_mtime is only part of the cache key so that changes
+# to the scanned directory invalidate the stored result
+@st.cache_data(ttl=3600, show_spinner=False)
+def _run_scan(drive, include_subdirs, sim_thresh, extensions_tuple, dir_mtime):
+    """Scan a directory and return its duplicate groups"""
+    scanner = FileScanner(
+        base_directory=drive,
+        include_subdirs=include_subdirs,
+        similarity_threshold=sim_thresh,
+        file_extensions=list(extensions_tuple) if extensions_tuple else None
+    )
+    scanner.inventory_files()
+    collections.deque(scanner.process_files(), maxlen=0)
+    return scanner.get_duplicate_groups()
+
+def _scan_one(drive, include_subdirs, sim_thresh):
+    """Scan a single drive through the result cache"""
+    return _run_scan(drive, include_subdirs, sim_thresh, None, os.stat(drive).st_mtime)
+
+# Keep the session's scanner alive across reruns while its options are unchanged;
+# scanners are mutable, so they are never shared between sessions
+def get_scanner(base, subdirs, thresh, ext_tuple):
+    options = (base, subdirs, thresh, ext_tuple)
+    if st.session_state.scanner is None or st.session_state.get("scanner_options") != options:
+        st.session_state.scanner = FileScanner(
+            base_directory=base,
+            include_subdirs=subdirs,
+            similarity_threshold=thresh,
+            file_extensions=list(ext_tuple) if ext_tuple else None
+        )
+        st.session_state.scanner_options = options
+    return st.session_state.scanner
+
 # File operations
 def open_file(file_path):
     """Open file with default application"""
@@ -189,10 +252,96 @@ def open_file_location(file_path):
         st.error(f"❌ Failed to open file location: {str(e)}")
         return False
 
+@functools.lru_cache(maxsize=8192)
+def _basename(path):
+    """Memoized os.path.basename for paths shown repeatedly in the UI"""
+    return os.path.basename(path)
+
+def _safe_remove(path):
+    """Remove a file, returning (path, exception or None)"""
+    try:
+        _remove_file(path)
+        return path, None
+    except Exception as e:
+        return path, e
+
+def _remove_files(paths):
+    """Remove several files, concurrently when they are deleted outright"""
+    # send2trash picks a free name in the trash without locking, so concurrent
+    # moves of same-named files race for it; trash them one at a time
+    if _remove_file is not os.remove:
+        return [_safe_remove(path) for path in paths]
+    
+    # Plain deletes are I/O-bound and independent
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return list(executor.map(_safe_remove, paths))
+
+# Markup for one file card in the results view
+_FILE_CARD_TPL = (
+    '<div class="file-action-card">'
+    '<h5>📄 {num}. {name}</h5>'
+    '<p><strong>📂 Path:</strong> {path}</p>'
+    '<p><strong>💾 Size:</strong> {size_kb:.2f} KB | <strong>📅 Modified:</strong> {mod}</p>'
+    '{extra}'
+    '</div>'
+)
+_HASH_LINE_TPL = '<p><strong>🔍 Content Hash:</strong> {}...</p>'
+
+# Files per row of action buttons; each file gets three buttons
+_BUTTON_FILES_PER_ROW = 3
+
+# Result groups rendered per page
+_RESULTS_PAGE_SIZE = 20
+
+def _page_of(items, key):
+    """Show a page picker when items span several pages; returns (first index, visible items)"""
+    max_pages = max(1, -(-len(items) // _RESULTS_PAGE_SIZE))
+    page = 1
+    if max_pages > 1:
+        page = st.number_input(f"📄 Page (of {max_pages})", min_value=1, max_value=max_pages,
+                               value=1, key=key)
+    start = (page - 1) * _RESULTS_PAGE_SIZE
+    return start, items[start:start + _RESULTS_PAGE_SIZE]
+
+def _render_file_cards(files, basenames, show_hash=False):
+    """Build the HTML for all file cards of a group in one string"""
+    return "".join(
+        _FILE_CARD_TPL.format_map({
+            "num": j + 1,
+            "name": basenames[j],
+            "path": file_info.path,
+            "size_kb": file_info.size / 1024,
+            "mod": file_info.modified.strftime("%Y-%m-%d %H:%M"),
+            "extra": _HASH_LINE_TPL.format(file_info.content_hash[:8] if file_info.content_hash else "N/A") if show_hash else ""
+        })
+        for j, file_info in enumerate(files)
+    )
+
+def _changed_since_scan(file_info):
+    """True if a file is gone or its size or modification time differ from the scan"""
+    try:
+        file_stat = os.stat(file_info.path)
+    except OSError:
+        return True
+    return (file_stat.st_size != file_info.size
+            or datetime.fromtimestamp(file_stat.st_mtime) != file_info.modified)
+
+def _refuse_changed_files(files):
+    """Report files that changed since the scan; True if deleting must not go ahead"""
+    changed = [f for f in files if _changed_since_scan(f)]
+    if not changed:
+        return False
+    
+    names = ", ".join(_basename(f.path) for f in changed)
+    st.error(f"❌ {len(changed)} files changed since the scan ({names}). Please rescan before deleting.")
+    # Cached results may predate the change too, so the rescan must hash again
+    _run_scan.clear()
+    return True
+
 # Helper functions for file deletion with confirmation
 def _delete_older_duplicates(files, group_index):
     """Delete all but the newest file in a duplicate group with confirmation"""
-    sorted_files = sorted(files, key=lambda f: f.modified, reverse=True)
+    sorted_files = sorted(files, key=attrgetter('modified'), reverse=True)
     
     st.markdown("""
     <div class="feature-card">
@@ -201,27 +350,31 @@ def _delete_older_duplicates(files, group_index):
     """, unsafe_allow_html=True)
     
     st.write("**Will KEEP (newest):**")
-    st.success(f"✅ {os.path.basename(sorted_files[0].path)} - {sorted_files[0].path}")
+    st.success(f"✅ {_basename(sorted_files[0].path)} - {sorted_files[0].path}")
     
     st.write("**Will DELETE:**")
     files_to_delete = sorted_files[1:]
     for file_info in files_to_delete:
-        st.error(f"❌ {os.path.basename(file_info.path)} - {file_info.path}")
+        st.error(f"❌ {_basename(file_info.path)} - {file_info.path}")
     
     if st.button(f"🗑️ CONFIRM Delete {len(files_to_delete)} older files", key=f"confirm_keep_newest_{group_index}"):
+        if _refuse_changed_files(sorted_files):
+            return
+        
         deleted_count = 0
         deleted_files = []
-        for file_info in files_to_delete:
-            try:
-                os.remove(file_info.path)
+        deleted_paths = []
+        for path, error in _remove_files([f.path for f in files_to_delete]):
+            if error is None:
                 deleted_count += 1
-                deleted_files.append(os.path.basename(file_info.path))
-            except Exception as e:
-                st.error(f"Failed to delete {os.path.basename(file_info.path)}: {str(e)}")
+                deleted_files.append(_basename(path))
+                deleted_paths.append(path)
+            else:
+                st.error(f"Failed to delete {_basename(path)}: {str(error)}")
         
         if deleted_count > 0:
             st.success(f"✅ Successfully deleted {deleted_count} files: {', '.join(deleted_files)}")
-            _update_scan_results_after_deletion()
+            _update_scan_results_after_deletion(deleted_paths)
         else:
             st.warning("No files were deleted")
 
@@ -236,26 +389,30 @@ def _delete_all_duplicates(files, group_index):
     st.write("**Will DELETE ALL files in this group:**")
     file_names = []
     for file_info in files:
-        file_name = os.path.basename(file_info.path)
+        file_name = _basename(file_info.path)
         file_names.append(file_name)
         st.error(f"❌ {file_name} - {file_info.path}")
     
     st.warning("⚠️ This will delete ALL files in this group!")
     
     if st.button(f"🗑️ CONFIRM Delete ALL {len(files)} files: {', '.join(file_names[:3])}{'...' if len(file_names) > 3 else ''}", key=f"confirm_delete_all_{group_index}"):
+        if _refuse_changed_files(files):
+            return
+        
         deleted_count = 0
         deleted_files = []
-        for file_info in files:
-            try:
-                os.remove(file_info.path)
+        deleted_paths = []
+        for path, error in _remove_files([f.path for f in files]):
+            if error is None:
                 deleted_count += 1
-                deleted_files.append(os.path.basename(file_info.path))
-            except Exception as e:
-                st.error(f"Failed to delete {os.path.basename(file_info.path)}: {str(e)}")
+                deleted_files.append(_basename(path))
+                deleted_paths.append(path)
+            else:
+                st.error(f"Failed to delete {_basename(path)}: {str(error)}")
         
         if deleted_count > 0:
             st.success(f"✅ Successfully deleted all {deleted_count} files: {', '.join(deleted_files)}")
-            _update_scan_results_after_deletion()
+            _update_scan_results_after_deletion(deleted_paths)
         else:
             st.warning("No files were deleted")
 
@@ -273,54 +430,103 @@ def _delete_selected_files(files_to_delete, group_index):
     
     selected_names = []
     for file_info in files_to_delete:
-        file_name = os.path.basename(file_info.path)
+        file_name = _basename(file_info.path)
         selected_names.append(file_name)
         st.error(f"❌ {file_name} - {file_info.path}")
     
     if st.button(f"🗑️ CONFIRM Delete {len(files_to_delete)} files: {', '.join(selected_names[:3])}{'...' if len(selected_names) > 3 else ''}", key=f"confirm_selected_{group_index}"):
+        if _refuse_changed_files(files_to_delete):
+            return
+        
         deleted_count = 0
         deleted_files = []
-        for file_info in files_to_delete:
-            try:
-                os.remove(file_info.path)
+        deleted_paths = []
+        for path, error in _remove_files([f.path for f in files_to_delete]):
+            if error is None:
                 deleted_count += 1
-                deleted_files.append(os.path.basename(file_info.path))
-            except Exception as e:
-                st.error(f"Failed to delete {os.path.basename(file_info.path)}: {str(e)}")
+                deleted_files.append(_basename(path))
+                deleted_paths.append(path)
+            else:
+                st.error(f"Failed to delete {_basename(path)}: {str(error)}")
         
         if deleted_count > 0:
             st.success(f"✅ Successfully deleted {deleted_count} files: {', '.join(deleted_files)}")
-            _update_scan_results_after_deletion()
+            _update_scan_results_after_deletion(deleted_paths)
         else:
             st.warning("No files were selected for deletion")
 
-def _update_scan_results_after_deletion():
-    """Update scan results after files have been deleted"""
+def _update_scan_results_after_deletion(deleted_paths):
+    """Drop deleted files from the scan results without rescanning"""
+    deleted = set(deleted_paths)
     if st.session_state.scanner:
-        st.session_state.scanner.inventory_files()
-        list(st.session_state.scanner.process_files())
-        st.session_state.scan_results = st.session_state.scanner.get_duplicate_groups()
-        st.rerun()
+        for path in deleted:
+            st.session_state.scanner.remove_file(path)
+    
+    remaining_groups = {}
+    for group_id, files in st.session_state.scan_results.items():
+        remaining = [f for f in files if f.path not in deleted]
+        if len(remaining) > 1:
+            remaining_groups[group_id] = remaining
+    
+    st.session_state.scan_results = remaining_groups
+    # Groups are renumbered after a deletion, so open dialogs no longer apply
+    st.session_state.group_flags.clear()
+    # Deleting below the scan root leaves its mtime unchanged, so cached
+    # scans would otherwise keep listing the deleted files
+    _run_scan.clear()
+    st.rerun()
+
+def _get_classified_results(scan_results):
+    """
+    Classify this session's scan results, reusing the previous split while
+    the results are still the same object. Every scan and deletion stores a
+    new dict, so an identity check is enough to detect changes.
+    """
+    cached = st.session_state.get("classified_results")
+    if cached is None or cached[0] is not scan_results:
+        cached = (scan_results, _classify_scan_results(scan_results))
+        st.session_state.classified_results = cached
+    return cached[1]
+
+def _classify_scan_results(scan_results):
+    """Split scan results into identical-content groups and same-name groups"""
+    groups = {k: files for k, files in scan_results.items() if len(files) > 1}
+    if not groups:
+        return {}, {}
+    
+    all_files = [f for files in groups.values() for f in files]
+    df = pd.DataFrame({
+        'hash_val': [k for k, files in groups.items() for _ in files],
+        'name': [f.name for f in all_files],
+        'content_hash': [f.content_hash for f in all_files]
+    })
+    
+    # A group is a content match when every file is hashed and the hashes agree;
+    # files with a unique size are never hashed
+    hashes = df.groupby('hash_val', sort=False)['content_hash']
+    same_content = (hashes.nunique() == 1) & (hashes.count() == hashes.size())
+    content_keys = set(same_content[same_content].index)
+    content_matches = {k: files for k, files in groups.items() if k in content_keys}
+    
+    # Remaining files are grouped by name
+    rest = df[~df['hash_val'].isin(content_keys)]
+    rest = rest[rest.duplicated('name', keep=False)]
+    filename_matches = {
+        name: [all_files[i] for i in group.index]
+        for name, group in rest.groupby('name', sort=False)
+    }
+    
+    return content_matches, filename_matches
 
 def display_scan_results():
     """Display scan results with file actions"""
     if st.session_state.scan_results:
         # Separate content matches and filename matches
-        content_matches = {}
-        filename_matches = {}
+        scan_results = st.session_state.scan_results
+        content_matches, filename_matches = _get_classified_results(scan_results)
         
-        for hash_val, files in st.session_state.scan_results.items():
-            if len(files) > 1:
-                first_file = files[0]
-                has_same_content = all(f.content_hash == first_file.content_hash for f in files if f.content_hash)
-                
-                if has_same_content:
-                    content_matches[hash_val] = files
-                else:
-                    for file in files:
-                        if file.name not in filename_matches:
-                            filename_matches[file.name] = []
-                        filename_matches[file.name].append(file)
+        # Per-group dialog flags, keyed by (group index, action)
+        flags = st.session_state.group_flags
         
         # Display statistics
         col1, col2, col3 = st.columns(3)
@@ -340,40 +546,43 @@ def display_scan_results():
             </div>
             """, unsafe_allow_html=True)
             
-            for i, (hash_value, files) in enumerate(content_matches.items()):
-                with st.expander(f"📁 Group {i+1} ({len(files)} matching files)", expanded=True):
-                    # File details with action buttons
-                    for j, file_info in enumerate(files):
-                        st.markdown(f"""
-                        <div class="file-action-card">
-                            <h5>📄 {os.path.basename(file_info.path)}</h5>
-                            <p><strong>📂 Path:</strong> {file_info.path}</p>
-                            <p><strong>💾 Size:</strong> {file_info.size / 1024:.2f} KB | <strong>📅 Modified:</strong> {file_info.modified.strftime("%Y-%m-%d %H:%M")}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # File action buttons
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            if st.button(f"📂 Open File", key=f"open_file_{i}_{j}"):
-                                if open_file(file_info.path):
-                                    st.success(f"✅ Opened: {os.path.basename(file_info.path)}")
-                        
-                        with col2:
-                            if st.button(f"📍 Open Location", key=f"open_location_{i}_{j}"):
-                                if open_file_location(file_info.path):
-                                    st.success(f"✅ Opened location for: {os.path.basename(file_info.path)}")
-                        
-                        with col3:
-                            if st.button(f"🗑️ Delete {os.path.basename(file_info.path)}", key=f"delete_single_{i}_{j}"):
-                                try:
-                                    os.remove(file_info.path)
-                                    st.success(f"✅ Deleted: {os.path.basename(file_info.path)}")
-                                    _update_scan_results_after_deletion()
-                                except Exception as e:
-                                    st.error(f"❌ Failed to delete {os.path.basename(file_info.path)}: {str(e)}")
-                        
-                        st.divider()
+            # Only build the widgets for the visible page of groups
+            start, page_items = _page_of(list(content_matches.items()), "content_page")
+            
+            for i, (hash_value, files) in enumerate(page_items, start=start):
+                with st.expander(f"📁 Group {i+1} ({len(files)} matching files)", expanded=False):
+                    basenames = [_basename(f.path) for f in files]
+                    
+                    # File details, rendered as a single markdown block
+                    html_blocks = _render_file_cards(files, basenames)
+                    st.markdown(html_blocks, unsafe_allow_html=True)
+                    
+                    # File action buttons, three per file, a few files per row so wide groups wrap
+                    for row_start in range(0, len(files), _BUTTON_FILES_PER_ROW):
+                        button_row = st.columns(3 * _BUTTON_FILES_PER_ROW)
+                        for k, file_info in enumerate(files[row_start:row_start + _BUTTON_FILES_PER_ROW]):
+                            j = row_start + k
+                            with button_row[3*k]:
+                                if st.button(f"📂 Open #{j+1}", key=f"open_file_{i}_{j}"):
+                                    if open_file(file_info.path):
+                                        st.success(f"✅ Opened: {basenames[j]}")
+                            
+                            with button_row[3*k + 1]:
+                                if st.button(f"📍 Location #{j+1}", key=f"open_location_{i}_{j}"):
+                                    if open_file_location(file_info.path):
+                                        st.success(f"✅ Opened location for: {basenames[j]}")
+                            
+                            with button_row[3*k + 2]:
+                                if st.button(f"🗑️ Delete #{j+1}", key=f"delete_single_{i}_{j}"):
+                                    if not _refuse_changed_files([file_info]):
+                                        try:
+                                            _remove_file(file_info.path)
+                                            st.success(f"✅ Deleted: {basenames[j]}")
+                                            _update_scan_results_after_deletion([file_info.path])
+                                        except Exception as e:
+                                            st.error(f"❌ Failed to delete {basenames[j]}: {str(e)}")
+                    
+                    st.divider()
                     
                     # Group action buttons
                     st.markdown("### 🛠️ Group Actions")
@@ -381,44 +590,44 @@ def display_scan_results():
                     
                     with col1:
                         if st.button(f"📅 Keep Newest Only", key=f"keep_newest_{i}", type="secondary"):
-                            st.session_state[f"show_keep_newest_{i}"] = True
+                            flags[(i, 'keep_newest')] = True
                     
                     with col2:
                         if st.button(f"🗑️ Delete All Files", key=f"delete_all_{i}", type="secondary"):
-                            st.session_state[f"show_delete_all_{i}"] = True
+                            flags[(i, 'delete_all')] = True
                     
                     with col3:
                         if st.button(f"✅ Select Files to Delete", key=f"select_delete_{i}", type="secondary"):
-                            st.session_state[f"show_selection_{i}"] = True
+                            flags[(i, 'selection')] = True
                     
                     # Show confirmation dialogs
-                    if st.session_state.get(f"show_keep_newest_{i}", False):
+                    if flags.get((i, 'keep_newest'), False):
                         st.divider()
                         _delete_older_duplicates(files, i)
                         if st.button(f"❌ Cancel", key=f"cancel_keep_newest_{i}"):
-                            st.session_state[f"show_keep_newest_{i}"] = False
+                            flags[(i, 'keep_newest')] = False
                             st.rerun()
                     
-                    if st.session_state.get(f"show_delete_all_{i}", False):
+                    if flags.get((i, 'delete_all'), False):
                         st.divider()
                         _delete_all_duplicates(files, i)
                         if st.button(f"❌ Cancel", key=f"cancel_delete_all_{i}"):
-                            st.session_state[f"show_delete_all_{i}"] = False
+                            flags[(i, 'delete_all')] = False
                             st.rerun()
                     
-                    if st.session_state.get(f"show_selection_{i}", False):
+                    if flags.get((i, 'selection'), False):
                         st.divider()
                         st.write("**Select files to delete:**")
                         files_to_delete = []
                         for j, file_info in enumerate(files):
-                            if st.checkbox(f"🗑️ Delete: {os.path.basename(file_info.path)}", key=f"select_{i}_{j}"):
+                            if st.checkbox(f"🗑️ Delete: {basenames[j]}", key=f"select_{i}_{j}"):
                                 files_to_delete.append(file_info)
                         
                         if len(files_to_delete) > 0:
                             _delete_selected_files(files_to_delete, i)
                         
                         if st.button(f"❌ Cancel Selection", key=f"cancel_selection_{i}"):
-                            st.session_state[f"show_selection_{i}"] = False
+                            flags[(i, 'selection')] = False
                             st.rerun()
         
         # Filename matches section
@@ -429,41 +638,41 @@ def display_scan_results():
             </div>
             """, unsafe_allow_html=True)
             
-            for k, (filename, files) in enumerate(filename_matches.items()):
+            # Only build the widgets for the visible page of groups
+            start, page_items = _page_of(list(filename_matches.items()), "name_page")
+            
+            for k, (filename, files) in enumerate(page_items, start=start):
                 if len(files) > 1:
-                    with st.expander(f"📝 Name Group {k+1} ({len(files)} files with same name)", expanded=True):
-                        for j, file_info in enumerate(files):
-                            st.markdown(f"""
-                            <div class="file-action-card">
-                                <h5>📄 {os.path.basename(file_info.path)}</h5>
-                                <p><strong>📂 Path:</strong> {file_info.path}</p>
-                                <p><strong>💾 Size:</strong> {file_info.size / 1024:.2f} KB | <strong>📅 Modified:</strong> {file_info.modified.strftime("%Y-%m-%d %H:%M")}</p>
-                                <p><strong>🔍 Content Hash:</strong> {file_info.content_hash[:8] if file_info.content_hash else "N/A"}...</p>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            # File action buttons
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                if st.button(f"📂 Open File", key=f"open_name_file_{filename}_{j}"):
-                                    if open_file(file_info.path):
-                                        st.success(f"✅ Opened: {os.path.basename(file_info.path)}")
-                            
-                            with col2:
-                                if st.button(f"📍 Open Location", key=f"open_name_location_{filename}_{j}"):
-                                    if open_file_location(file_info.path):
-                                        st.success(f"✅ Opened location for: {os.path.basename(file_info.path)}")
-                            
-                            with col3:
-                                if st.button(f"🗑️ Delete {os.path.basename(file_info.path)}", key=f"delete_name_single_{filename}_{j}"):
-                                    try:
-                                        os.remove(file_info.path)
-                                        st.success(f"✅ Deleted: {os.path.basename(file_info.path)}")
-                                        _update_scan_results_after_deletion()
-                                    except Exception as e:
-                                        st.error(f"❌ Failed to delete {os.path.basename(file_info.path)}: {str(e)}")
-                            
-                            st.divider()
+                    with st.expander(f"📝 Name Group {k+1} ({len(files)} files with same name)", expanded=False):
+                        basenames = [_basename(f.path) for f in files]
+                        
+                        html_blocks = _render_file_cards(files, basenames, show_hash=True)
+                        st.markdown(html_blocks, unsafe_allow_html=True)
+                        
+                        # File action buttons, three per file, a few files per row so wide groups wrap
+                        for row_start in range(0, len(files), _BUTTON_FILES_PER_ROW):
+                            button_row = st.columns(3 * _BUTTON_FILES_PER_ROW)
+                            for k, file_info in enumerate(files[row_start:row_start + _BUTTON_FILES_PER_ROW]):
+                                j = row_start + k
+                                with button_row[3*k]:
+                                    if st.button(f"📂 Open #{j+1}", key=f"open_name_file_{filename}_{j}"):
+                                        if open_file(file_info.path):
+                                            st.success(f"✅ Opened: {basenames[j]}")
+                                
+                                with button_row[3*k + 1]:
+                                    if st.button(f"📍 Location #{j+1}", key=f"open_name_location_{filename}_{j}"):
+                                        if open_file_location(file_info.path):
+                                            st.success(f"✅ Opened location for: {basenames[j]}")
+                                
+                                with button_row[3*k + 2]:
+                                    if st.button(f"🗑️ Delete #{j+1}", key=f"delete_name_single_{filename}_{j}"):
+                                        if not _refuse_changed_files([file_info]):
+                                            try:
+                                                _remove_file(file_info.path)
+                                                st.success(f"✅ Deleted: {basenames[j]}")
+                                                _update_scan_results_after_deletion([file_info.path])
+                                            except Exception as e:
+                                                st.error(f"❌ Failed to delete {basenames[j]}: {str(e)}")
     else:
         st.success("✅ No duplicate files found!")
 
@@ -499,12 +708,8 @@ if 'monitor' not in st.session_state:
     st.session_state.monitor = None
 if 'auto_scan_complete' not in st.session_state:
     st.session_state.auto_scan_complete = False
-
-# Initialize selection states for file deletion
-for i in range(100):
-    for state in ['show_selection', 'show_keep_newest', 'show_delete_all']:
-        if f'{state}_{i}' not in st.session_state:
-            st.session_state[f'{state}_{i}'] = False
+if 'group_flags' not in st.session_state:
+    st.session_state.group_flags = {}
 
 # Main header
 st.markdown("""
@@ -565,21 +770,18 @@ with col1:
             status_text = st.empty()
             
             all_results = {}
-            total_drives = len(selected_drives)
+            scan_drives = [drive for drive in selected_drives if os.path.exists(drive)]
+            total_drives = max(len(scan_drives), 1)
+            status_text.text(f"🔍 Scanning {', '.join(scan_drives)}... (excludes Recycle Bin)")
             
-            for i, drive in enumerate(selected_drives):
-                if os.path.exists(drive):
-                    status_text.text(f"🔍 Scanning {drive}... (excludes Recycle Bin)")
-                    
-                    scanner = FileScanner(
-                        base_directory=drive,
-                        include_subdirs=include_subdirs_auto,
-                        similarity_threshold=similarity_threshold_auto/100
-                    )
-                    
-                    scanner.inventory_files()
-                    list(scanner.process_files())
-                    drive_results = scanner.get_duplicate_groups()
+            # Drives have independent I/O queues, so scan them concurrently
+            with ThreadPoolExecutor(max_workers=total_drives) as executor:
+                futures = {
+                    executor.submit(_scan_one, drive, include_subdirs_auto, similarity_threshold_auto/100): drive
+                    for drive in scan_drives
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    drive_results = future.result()
                     
                     # Merge results
                     for hash_val, files in drive_results.items():
@@ -588,11 +790,13 @@ with col1:
                         else:
                             all_results[hash_val] = files
                     
-                    progress_bar.progress((i + 1) / total_drives)
+                    progress_bar.progress(done / total_drives)
+                    status_text.text(f"🔍 Finished {futures[future]} ({done} of {len(scan_drives)})")
             
             st.session_state.scan_results = all_results
             st.session_state.auto_scan_complete = True
-            st.session_state.scanner = scanner  # Store the last scanner
+            # Results span several drives; deletions update them in place
+            st.session_state.scanner = None
             progress_bar.progress(1.0)
             status_text.text("✅ Smart scan complete! Found duplicate groups below.")
             st.rerun()
@@ -603,10 +807,7 @@ with col2:
     st.write("**Available Drives:**")
     for drive in drives:
         try:
-            usage = psutil.disk_usage(drive)
-            free_space = usage.free / (1024**3)  # Convert to GB
-            total_space = usage.total / (1024**3)
-            used_percent = (usage.used / usage.total) * 100
+            used_percent, free_space, total_space = get_drive_usage(drive)
             st.write(f"💾 **{drive}**")
             st.write(f"   📊 {used_percent:.1f}% used")
             st.write(f"   💿 {free_space:.1f}GB free / {total_space:.1f}GB total")
@@ -649,26 +850,40 @@ with tab_scanner:
     
     if st.button("🚀 Start Scan", key="start_scan", type="primary"):
         if os.path.exists(scan_directory):
-            st.session_state.scanner = FileScanner(
-                base_directory=scan_directory,
-                include_subdirs=include_subdirs,
-                similarity_threshold=similarity_threshold/100,
-                file_extensions=file_extensions if file_extensions else None
+            st.session_state.scanner = get_scanner(
+                scan_directory,
+                include_subdirs,
+                similarity_threshold/100,
+                tuple(file_extensions)
             )
             
             progress_bar = st.progress(0)
             status_text = st.empty()
             
             status_text.text("📋 Inventorying files (excluding Recycle Bin)...")
-            st.session_state.scanner.inventory_files()
             
-            total_files = len(st.session_state.scanner.file_inventory)
-            status_text.text(f"🔍 Analyzing {total_files} files...")
+            # Walk the tree on a worker so the status line can report progress
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                inventory_future = executor.submit(st.session_state.scanner.inventory_files)
+                while not inventory_future.done():
+                    status_text.text(f"📋 Inventorying files... {len(st.session_state.scanner.file_inventory)} so far")
+                    time.sleep(0.2)
+                inventory_future.result()
+            
+            status_text.text(f"🔍 Analyzing {len(st.session_state.scanner.file_inventory)} files...")
             
+            # Only files that may have a duplicate are hashed; their count is
+            # known once the first one is yielded
+            total_files = update_every = None
             for i, _ in enumerate(st.session_state.scanner.process_files()):
-                progress = min(i / max(total_files, 1), 1.0)
-                progress_bar.progress(progress)
-                status_text.text(f"📊 Processed {i+1} of {total_files} files...")
+                if total_files is None:
+                    total_files = st.session_state.scanner.candidate_count
+                    # Limit UI updates to roughly 100 regardless of file count
+                    update_every = max(1, total_files // 100)
+                if i % update_every == 0 or i == total_files - 1:
+                    progress = min((i + 1) / max(total_files, 1), 1.0)
+                    progress_bar.progress(progress)
+                    status_text.text(f"📊 Hashed {i+1} of {total_files} candidate files...")
             
             progress_bar.progress(1.0)
             st.session_state.scan_results = st.session_state.scanner.get_duplicate_groups()
@@ -721,26 +936,26 @@ with tab_organizer:
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    total_files = sum(len(files) for files in organization_plan.values())
-                    processed = 0
+                    def update_progress(processed, total_files):
+                        progress_bar.progress(min(processed / total_files, 1.0))
+                        status_text.text(f"📊 Processed {processed} of {total_files} files...")
                     
-                    for group_name, files in organization_plan.items():
-                        for file_info in files:
-                            if organize_option == "Move duplicates to folders":
-                                organizer.move_file(file_info["source"], file_info["destination"])
-                            else:
-                                organizer.copy_file(file_info["source"], file_info["destination"])
-                            
-                            processed += 1
-                            progress = min(processed / total_files, 1.0)
-                            progress_bar.progress(progress)
-                            status_text.text(f"📊 Processed {processed} of {total_files} files...")
+                    move_files = organize_option == "Move duplicates to folders"
+                    stats = organizer.execute_organization_plan(
+                        move_files=move_files,
+                        progress_callback=update_progress
+                    )
                     
                     progress_bar.progress(1.0)
                     status_text.text("✅ Organization complete!")
                     
-                    summary = organizer.get_summary()
-                    st.success(f"✅ Organized {summary['total_files']} files into {summary['total_groups']} groups.")
+                    action = "Moved" if move_files else "Copied"
+                    done = stats["moved"] + stats["copied"]
+                    size = utils.format_file_size(stats["total_size"])
+                    if stats["errors"]:
+                        st.warning(f"⚠️ {action} {done} files ({size}); {stats['errors']} could not be organized.")
+                    else:
+                        st.success(f"✅ {action} {done} files ({size}) into {len(organization_plan)} folders.")
 
 with tab_monitor:
     st.markdown("""
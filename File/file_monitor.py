@@ -1,24 +1,39 @@
 import os
 import time
+import queue
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from collections import defaultdict
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-from file_scanner import FileScanner, FileInfo
+from watchdog.events import PatternMatchingEventHandler
+from file_scanner import FileScanner, FileInfo, compute_hash
+from hash_cache import get_hash_cache
 
-class FileEventHandler(FileSystemEventHandler):
+# Partial downloads, editor swap files and lock files never reach the queue
+IGNORE_PATTERNS = ["*.tmp", "*.temp", "*.part", "*.partial", "*.crdownload", "*.download",
+                   "*.swp", "*.swx", "*~", "~$*", ".~lock.*#"]
+
+# A file is processed once it has had no events for this long and its size
+# stayed the same over that time, so files still being written are left alone
+SETTLE_SECONDS = 1.0
+
+class FileEventHandler(PatternMatchingEventHandler):
     """Handles file system events for monitoring"""
     
     def __init__(self, monitor):
+        super().__init__(ignore_patterns=IGNORE_PATTERNS, ignore_directories=True)
         self.monitor = monitor
         
     def on_created(self, event):
-        if not event.is_directory:
-            self.monitor.process_new_file(event.src_path)
+        self.monitor.enqueue_file(event.src_path)
             
     def on_moved(self, event):
-        if not event.is_directory:
-            self.monitor.process_new_file(event.dest_path)
+        self.monitor.enqueue_file(event.dest_path)
+    
+    def on_modified(self, event):
+        # Writes to a queued file push back its processing
+        self.monitor.enqueue_file(event.src_path)
 
 class FileMonitor:
     """Monitors directories for new files and detects duplicates"""
@@ -32,7 +47,16 @@ class FileMonitor:
         self.observer = Observer()
         self.event_handler = FileEventHandler(self)
         self.activity_log = []
-        self.known_files = {}
+        # Hashes are keyed together with the size, and files are only hashed once
+        # another file of the same size shows up
+        self.known_files: Dict[Tuple[int, str], FileInfo] = {}
+        self.size_index: Dict[int, List[FileInfo]] = defaultdict(list)
+        self.path_index: Dict[str, FileInfo] = {}
+        
+        # New paths are queued by the observer thread and hashed by a worker once settled
+        self.event_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.worker: Optional[threading.Thread] = None
+        self.hash_cache = get_hash_cache()
         
         # Initial scan to build inventory
         self._build_initial_inventory()
@@ -43,11 +67,13 @@ class FileMonitor:
         scanner.inventory_files()
         
         for file_info in scanner.file_inventory:
-            file_hash = scanner._calculate_file_hash(file_info.path)
-            self.known_files[file_hash] = file_info
+            self.size_index[file_info.size].append(file_info)
+            self.path_index[file_info.path] = file_info
     
     def start_monitoring(self):
         """Start monitoring the directory"""
+        self.worker = threading.Thread(target=self._process_events, daemon=True)
+        self.worker.start()
         self.observer.schedule(self.event_handler, self.directory, recursive=True)
         self.observer.start()
         self.log_activity("Started monitoring directory")
@@ -56,41 +82,147 @@ class FileMonitor:
         """Stop monitoring"""
         self.observer.stop()
         self.observer.join()
+        
+        # Wake the worker so it can exit; files still settling are left alone
+        self.event_queue.put(None)
+        if self.worker is not None:
+            self.worker.join()
         self.log_activity("Stopped monitoring directory")
     
+    def enqueue_file(self, file_path: str):
+        """Queue a newly detected file for batched processing"""
+        # Files we moved into the organize folder are not new
+        organize_root = os.path.join(os.path.abspath(self.organize_path), "")
+        if os.path.abspath(file_path).startswith(organize_root):
+            return
+        self.event_queue.put(file_path)
+    
+    def _process_events(self):
+        """Worker loop: process each queued path once it has settled, until stopped"""
+        # Path -> (deadline, size when the deadline was set)
+        pending: Dict[str, Tuple[float, Optional[int]]] = {}
+        
+        while True:
+            timeout = None
+            if pending:
+                next_deadline = min(deadline for deadline, _ in pending.values())
+                timeout = max(0.0, next_deadline - time.monotonic())
+            
+            try:
+                file_path = self.event_queue.get(timeout=timeout)
+            except queue.Empty:
+                pass
+            else:
+                if file_path is None:
+                    return
+                # Every event for a path restarts its quiet period
+                pending[file_path] = (time.monotonic() + SETTLE_SECONDS, _file_size(file_path))
+            
+            # Due paths whose size still changed get another quiet period
+            settled = []
+            now = time.monotonic()
+            for path, (deadline, size) in list(pending.items()):
+                if deadline > now:
+                    continue
+                current_size = _file_size(path)
+                if current_size is not None and current_size != size:
+                    pending[path] = (now + SETTLE_SECONDS, current_size)
+                    continue
+                del pending[path]
+                if current_size is not None:
+                    settled.append(path)
+            
+            if settled:
+                self.process_new_files(settled)
+    
+    def process_new_files(self, file_paths: List[str]):
+        """Process a batch of newly detected files"""
+        for file_path in file_paths:
+            # Skip files that were removed or renamed again before we got to them
+            if os.path.isfile(file_path):
+                self.process_new_file(file_path)
+        
+        if self.hash_cache is not None:
+            self.hash_cache.commit()
+    
     def process_new_file(self, file_path: str):
         """Process a newly detected file"""
         try:
-            # Wait a bit for file to be completely written
-            time.sleep(1)
+            file_stat = os.stat(file_path)
+            size = file_stat.st_size
             
-            # Calculate hash of new file
-            scanner = FileScanner(os.path.dirname(file_path))
-            file_hash = scanner._calculate_file_hash(file_path)
+            # A path we already know was replaced or rewritten (e.g. an atomic save);
+            # drop its old entry so the file is never matched against itself
+            previous = self._forget_file(file_path)
             
-            # Check if it's a duplicate
-            if file_hash in self.known_files:
-                duplicate_file = self.known_files[file_hash]
-                self.log_activity(f"Duplicate detected: {os.path.basename(file_path)} matches {duplicate_file.name}")
+            # A file with a size no known file has can't be a duplicate, so skip hashing
+            file_hash = None
+            if self.size_index.get(size):
+                self._hash_known_files(size)
+                file_hash = compute_hash(file_path, hash_cache=self.hash_cache)
                 
-                if self.auto_organize:
-                    self._organize_duplicate(file_path, duplicate_file)
+                # Check if it's a duplicate
+                duplicate_file = self.known_files.get((size, file_hash))
+                if duplicate_file is not None:
+                    self.log_activity(f"Duplicate detected: {os.path.basename(file_path)} matches {duplicate_file.name}")
+                    
+                    if self.auto_organize:
+                        self._organize_duplicate(file_path, duplicate_file)
+                    return
+            
+            # Add to known files
+            file_info = FileInfo(
+                path=file_path,
+                name=os.path.basename(file_path),
+                size=size,
+                modified=datetime.fromtimestamp(file_stat.st_mtime),
+                content_hash=file_hash
+            )
+            self.size_index[size].append(file_info)
+            self.path_index[file_path] = file_info
+            if file_hash is not None:
+                self.known_files[(size, file_hash)] = file_info
+            if previous is not None:
+                self.log_activity(f"Changed file: {os.path.basename(file_path)}")
             else:
-                # Add to known files
-                file_stat = os.stat(file_path)
-                file_info = FileInfo(
-                    path=file_path,
-                    name=os.path.basename(file_path),
-                    size=file_stat.st_size,
-                    modified=datetime.fromtimestamp(file_stat.st_mtime),
-                    content_hash=file_hash
-                )
-                self.known_files[file_hash] = file_info
                 self.log_activity(f"New unique file: {os.path.basename(file_path)}")
                 
         except Exception as e:
             self.log_activity(f"Error processing {file_path}: {str(e)}")
     
+    def _hash_known_files(self, size: int):
+        """Hash the known files of a given size that haven't been hashed yet"""
+        for file_info in list(self.size_index[size]):
+            if file_info.content_hash is not None:
+                continue
+            try:
+                file_info.content_hash = compute_hash(file_info.path, hash_cache=self.hash_cache)
+            except OSError:
+                # Deleted or unreadable since it was indexed
+                self._forget_file(file_info.path)
+                continue
+            self.known_files.setdefault((size, file_info.content_hash), file_info)
+    
+    def _forget_file(self, file_path: str) -> Optional[FileInfo]:
+        """Remove a path from the indexes, promoting another file with the same content"""
+        file_info = self.path_index.pop(file_path, None)
+        if file_info is None:
+            return None
+        
+        same_size = self.size_index[file_info.size]
+        same_size.remove(file_info)
+        if not same_size:
+            del self.size_index[file_info.size]
+        
+        key = (file_info.size, file_info.content_hash)
+        if file_info.content_hash is not None and self.known_files.get(key) is file_info:
+            del self.known_files[key]
+            for other in same_size:
+                if other.content_hash == file_info.content_hash:
+                    self.known_files[key] = other
+                    break
+        return file_info
+    
     def _organize_duplicate(self, file_path: str, original_file: FileInfo):
         """Organize a duplicate file"""
         try:
@@ -124,4 +256,11 @@ class FileMonitor:
     
     def get_activity_log(self) -> List[Dict[str, str]]:
         """Get activity log"""
-        return self.activity_log
\ No newline at end of file
+        return self.activity_log
+
+def _file_size(file_path: str) -> Optional[int]:
+    """Current size of a file, None if it no longer exists"""
+    try:
+        return os.stat(file_path).st_size
+    except OSError:
+        return None
\ No newline at end of file
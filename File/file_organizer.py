@@ -1,7 +1,7 @@
 import os
 import shutil
-from pathlib import Path
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Callable
 from file_scanner import FileInfo
 import utils
 
@@ -25,18 +25,29 @@ class FileOrganizer:
                 
             # Create folder name based on file type and group
             first_file = files[0]
-            file_ext = Path(first_file.path).suffix
+            file_ext = first_file.ext
             folder_name = f"Duplicates_{first_file.name}_{group_id[:8]}"
             
             plan[folder_name] = []
             
             # Keep one file in original location if specified
             files_to_move = files[1:] if self.keep_original else files
+            dest_folder = os.path.join(self.destination_dir, folder_name)
+            used_names = set()
             
             for file_info in files_to_move:
                 source = file_info.path
-                dest_folder = os.path.join(self.destination_dir, folder_name)
-                destination = os.path.join(dest_folder, file_info.name)
+                
+                # Duplicates often share a name; give each its own destination so
+                # concurrent transfers never target the same path
+                dest_name = file_info.name
+                counter = 1
+                while dest_name in used_names or os.path.exists(os.path.join(dest_folder, dest_name)):
+                    name, ext = os.path.splitext(file_info.name)
+                    dest_name = f"{name}_{counter}{ext}"
+                    counter += 1
+                used_names.add(dest_name)
+                destination = os.path.join(dest_folder, dest_name)
                 
                 plan[folder_name].append({
                     "source": source,
@@ -46,34 +57,64 @@ class FileOrganizer:
         
         return plan
     
-    def execute_organization_plan(self, move_files: bool = True) -> Dict[str, Any]:
-        """Execute the organization plan"""
+    def move_file(self, source: str, destination: str) -> None:
+        """Move a single file into its duplicates folder"""
+        shutil.move(source, destination)
+    
+    def copy_file(self, source: str, destination: str) -> None:
+        """Copy a single file into its duplicates folder"""
+        # copy2 already uses sendfile() on Linux and CopyFile2 on Windows
+        shutil.copy2(source, destination)
+    
+    def execute_organization_plan(self, move_files: bool = True,
+                                  progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Execute the organization plan.
+        
+        Args:
+            move_files: Move the files if True, copy them otherwise
+            progress_callback: Called with (processed, total) after each file
+        
+        Returns:
+            Counts of moved, copied and failed files plus the bytes handled
+        """
         plan = self.generate_organization_plan()
         stats = {"moved": 0, "copied": 0, "errors": 0, "total_size": 0}
         
-        for folder_name, operations in plan.items():
+        # Create every destination folder before dispatching any file operation
+        operations = []
+        for folder_name, folder_ops in plan.items():
             dest_folder = os.path.join(self.destination_dir, folder_name)
-            
-            # Create destination folder
             try:
                 os.makedirs(dest_folder, exist_ok=True)
             except Exception as e:
-                stats["errors"] += 1
+                stats["errors"] += len(folder_ops)
                 continue
-            
-            for op in operations:
-                try:
-                    if move_files:
-                        shutil.move(op["source"], op["destination"])
-                        stats["moved"] += 1
-                    else:
-                        shutil.copy2(op["source"], op["destination"])
-                        stats["copied"] += 1
-                    
+            operations.extend(folder_ops)
+        
+        transfer = self.move_file if move_files else self.copy_file
+        
+        def run(op):
+            try:
+                transfer(op["source"], op["destination"])
+                return op, True
+            except Exception as e:
+                return op, False
+        
+        # File operations are I/O bound, so overlap them on a thread pool
+        total = len(operations)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(run, op) for op in operations]
+            for processed, future in enumerate(as_completed(futures), 1):
+                op, ok = future.result()
+                if ok:
+                    stats["moved" if move_files else "copied"] += 1
                     stats["total_size"] += op["size"]
-                    
-                except Exception as e:
+                else:
                     stats["errors"] += 1
+                
+                if progress_callback:
+                    progress_callback(processed, total)
         
         return stats
     
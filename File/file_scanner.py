@@ -1,13 +1,256 @@
 import os
+import sys
+import mmap
 import hashlib
+import functools
 import time
 from pathlib import Path
+from collections import defaultdict
 from datetime import datetime
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Set, Optional, Generator, Tuple
 import pandas as pd
 
-from pdf_similarity import calculate_pdf_similarity
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from pdf_similarity import calculate_pdf_similarity, extract_pdf_tokens, find_similar_pairs, simhash
+from hash_cache import HashCache, get_hash_cache
+
+# Number of leading bytes hashed to rule out same-size files before a full hash
+FAST_HASH_BYTES = 65536
+
+# File hashing is I/O-bound, so use more threads than cores
+HASH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Below this size BLAKE3's memory mapping and threading cost more than they save
+SMALL_FILE_BYTES = 1024 * 1024
+
+# Files handed to each pool task; batching amortizes per-file scheduling overhead
+HASH_BATCH_SIZE = 256
+
+# Largest file to memory-map; 32-bit builds can't map multi-gigabyte files
+MMAP_MAX_BYTES = sys.maxsize if sys.maxsize > 2**32 else 1024 * 1024 * 1024
+
+# Hash constructors by algorithm name; optional backends are only listed when installed.
+# md5, sha1 and sha256 are OpenSSL-backed, so SHA uses the CPU's SHA extensions when present
+HASH_FACTORIES = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+}
+if blake3 is not None:
+    HASH_FACTORIES["blake3"] = functools.partial(blake3.blake3, max_threads=blake3.blake3.AUTO)
+if xxhash is not None:
+    HASH_FACTORIES["xxh3"] = xxhash.xxh3_128
+
+# Packages providing the optional algorithms, for error messages
+_OPTIONAL_HASH_PACKAGES = {"blake3": "blake3", "xxh3": "xxhash"}
+
+# Supported values for hash_algo; "auto" picks the fastest installed backend per file size
+HASH_ALGORITHMS = ("auto", "md5", "sha1", "sha256", "blake3", "xxh3")
+
+# Bump when the hashing of an algorithm changes so stale cache entries stop matching
+HASH_SCHEME_VERSION = 1
+
+# Identifies which algorithms produced a hash, so cached hashes from a
+# different set of installed backends are never mixed with fresh ones
+HASH_SCHEME = (f"v{HASH_SCHEME_VERSION}:"
+               f"{'xxh3_128' if xxhash is not None else 'md5'}<{SMALL_FILE_BYTES}"
+               f"|{'blake3' if blake3 is not None else 'md5'}")
+
+def check_hash_algo(hash_algo: str) -> None:
+    """
+    Make sure a hash algorithm is supported and its backend is installed.
+    
+    Args:
+        hash_algo: One of HASH_ALGORITHMS
+    
+    Raises:
+        ValueError: If the algorithm is unknown or its package is missing
+    """
+    if hash_algo == "auto" or hash_algo in HASH_FACTORIES:
+        return
+    if hash_algo in _OPTIONAL_HASH_PACKAGES:
+        raise ValueError(f"The {hash_algo} hash algorithm requires the "
+                         f"{_OPTIONAL_HASH_PACKAGES[hash_algo]} package")
+    raise ValueError(f"Unsupported hash algorithm: {hash_algo}")
+
+def hash_scheme(hash_algo: str = "auto") -> str:
+    """
+    Get the hash cache key for an algorithm. Hashes made with one
+    algorithm are never returned for another.
+    
+    Args:
+        hash_algo: One of HASH_ALGORITHMS
+    
+    Returns:
+        Scheme identifier stored alongside cached hashes
+    """
+    if hash_algo == "auto":
+        return HASH_SCHEME
+    return f"v{HASH_SCHEME_VERSION}:{hash_algo}"
+
+def _new_hasher(size: int, hash_algo: str = "auto"):
+    """
+    Create a hash object for data of the given size.
+    With "auto", the fastest available backend is chosen per size;
+    duplicates always share a size, so mixing algorithms across sizes is safe.
+    
+    Args:
+        size: Number of bytes that will be hashed
+        hash_algo: One of HASH_ALGORITHMS
+        
+    Returns:
+        Hash object with update() and hexdigest()
+    """
+    if hash_algo != "auto":
+        factory = HASH_FACTORIES.get(hash_algo)
+        if factory is None:
+            check_hash_algo(hash_algo)
+        return factory()
+    
+    if xxhash is not None and size < SMALL_FILE_BYTES:
+        return HASH_FACTORIES["xxh3"]()
+    if blake3 is not None:
+        return HASH_FACTORIES["blake3"]()
+    return hashlib.md5()
+
+def compute_hash(file_path: str, max_bytes: Optional[int] = None,
+                 hash_cache: Optional[HashCache] = None, hash_algo: str = "auto") -> str:
+    """
+    Calculate a content hash for a file.
+    By default uses BLAKE3 (memory-mapped and multi-threaded) for large files
+    and xxh3_128 for small ones when installed, falling back to MD5.
+    
+    Args:
+        file_path: Path to the file
+        max_bytes: Only hash this many leading bytes, None for the whole file
+        hash_cache: Persistent cache to consult for full-file hashes
+        hash_algo: One of HASH_ALGORITHMS
+    
+    Returns:
+        String representation of the file's hash
+    """
+    return _cached_hash(file_path, max_bytes, hash_cache, hash_algo)
+
+def compute_hashes(file_paths: List[str], max_bytes: Optional[int] = None,
+                   hash_cache: Optional[HashCache] = None,
+                   hash_algo: str = "auto") -> List[Optional[str]]:
+    """
+    Calculate content hashes for a batch of files in one call.
+    Small files and leading samples are read into one reused buffer
+    instead of allocating a new bytes object per file.
+    
+    Args:
+        file_paths: Paths of the files to hash
+        max_bytes: Only hash this many leading bytes, None for whole files
+        hash_cache: Persistent cache to consult for full-file hashes
+        hash_algo: One of HASH_ALGORITHMS
+    
+    Returns:
+        Hashes in input order, None for files that couldn't be read
+    """
+    buffer = memoryview(bytearray(SMALL_FILE_BYTES if max_bytes is None else max_bytes))
+    hashes = []
+    append = hashes.append
+    
+    for file_path in file_paths:
+        try:
+            append(_cached_hash(file_path, max_bytes, hash_cache, hash_algo, buffer))
+        except OSError:
+            append(None)
+    
+    return hashes
+
+def _cached_hash(file_path: str, max_bytes: Optional[int], hash_cache: Optional[HashCache],
+                 hash_algo: str, buffer: Optional[memoryview] = None) -> str:
+    """Hash a file, going through the persistent cache for full-file hashes"""
+    # Full hashes of unchanged files are reused from the persistent cache
+    if max_bytes is None and hash_cache is not None:
+        scheme = hash_scheme(hash_algo)
+        file_stat = os.stat(file_path)
+        file_hash = hash_cache.get(file_stat, scheme)
+        if file_hash is None:
+            file_hash = _hash_file_contents(file_path, max_bytes, hash_algo, buffer)
+            hash_cache.put(file_stat, scheme, file_hash)
+        return file_hash
+    
+    return _hash_file_contents(file_path, max_bytes, hash_algo, buffer)
+
+def _hash_file_contents(file_path: str, max_bytes: Optional[int] = None,
+                        hash_algo: str = "auto", buffer: Optional[memoryview] = None) -> str:
+    """
+    Hash a file's contents without consulting the cache.
+    
+    Args:
+        file_path: Path to the file
+        max_bytes: Only hash this many leading bytes, None for the whole file
+        hash_algo: One of HASH_ALGORITHMS
+        buffer: Scratch buffer for small reads, at least max_bytes or
+            SMALL_FILE_BYTES long; a new bytes object is read when None
+    
+    Returns:
+        String representation of the file's hash
+    """
+    # Use buffer to hash files too large to map into memory
+    buffer_size = 65536  # 64kb chunks
+    
+    with open(file_path, 'rb') as f:
+        if max_bytes is not None:
+            file_hash = _new_hasher(max_bytes, hash_algo)
+            if buffer is None:
+                file_hash.update(f.read(max_bytes))
+            else:
+                file_hash.update(buffer[:f.readinto(buffer[:max_bytes])])
+            return file_hash.hexdigest()
+        
+        size = os.fstat(f.fileno()).st_size
+        file_hash = _new_hasher(size, hash_algo)
+        
+        if size < SMALL_FILE_BYTES:
+            # Not worth the mmap setup; a single read covers the file
+            if buffer is None:
+                file_hash.update(f.read())
+            else:
+                file_hash.update(buffer[:f.readinto(buffer)])
+        else:
+            # Large files are read front to back once; ask the kernel for aggressive readahead
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            
+            if blake3 is not None and isinstance(file_hash, blake3.blake3):
+                file_hash.update_mmap(file_path)
+            elif not (size <= MMAP_MAX_BYTES and _hash_mapped(f, file_hash)):
+                # Read into one reused buffer; update() releases the GIL for each chunk
+                chunk = memoryview(bytearray(buffer_size))
+                while True:
+                    n = f.readinto(chunk)
+                    if not n:
+                        break
+                    file_hash.update(chunk[:n])
+    
+    return file_hash.hexdigest()
+
+def _hash_mapped(f, file_hash) -> bool:
+    """Feed a whole memory-mapped file to a hasher in one call, False if it can't be mapped"""
+    try:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            file_hash.update(mapped)
+        return True
+    except (OSError, ValueError):
+        # Not mappable, e.g. on some network or virtual file systems
+        return False
 
 @dataclass
 class FileInfo:
@@ -18,13 +261,36 @@ class FileInfo:
     modified: datetime
     content_hash: Optional[str] = None
     similarity_group: Optional[str] = None
+    ext: Optional[str] = None
+    fingerprint: Optional[int] = None
+    
+    def __post_init__(self):
+        # Lowercased extension including the dot, derived from the name once
+        if self.ext is None:
+            self.ext = file_extension(self.name)
+
+def file_extension(file_name: str) -> str:
+    """
+    Get the lowercased extension of a file name, matching os.path.splitext.
+    
+    Args:
+        file_name: Name of the file, without directories
+    
+    Returns:
+        Extension including the dot, or an empty string
+    """
+    head, dot, tail = file_name.rpartition('.')
+    # Leading dots mark hidden files, not extensions
+    return dot + tail.lower() if head.strip('.') else ''
 
 class FileScanner:
     """Handles file scanning, hashing, and duplicate detection"""
     
     def __init__(self, base_directory: str, include_subdirs: bool = True, 
                  similarity_threshold: float = 1.0, 
-                 file_extensions: Optional[List[str]] = None):
+                 file_extensions: Optional[List[str]] = None,
+                 use_hash_cache: bool = True,
+                 hash_algo: str = "auto"):
         """
         Initialize the file scanner.
         
@@ -33,157 +299,316 @@ class FileScanner:
             include_subdirs: Whether to scan subdirectories
             similarity_threshold: Threshold for considering PDFs similar (0.0-1.0)
             file_extensions: List of file extensions to include, None for all
+            use_hash_cache: Whether to reuse hashes of unchanged files from previous runs
+            hash_algo: Hash algorithm, one of HASH_ALGORITHMS; "auto" uses BLAKE3
+                for large files and xxh3 for small ones when installed
         """
+        check_hash_algo(hash_algo)
+        
         self.base_directory = os.path.abspath(base_directory)
         self.include_subdirs = include_subdirs
         self.similarity_threshold = similarity_threshold
-        self.file_extensions = file_extensions
+        # Normalized once so the per-file check is a single set lookup
+        self.file_extensions = (frozenset(ext.lower() for ext in file_extensions)
+                                if file_extensions else None)
+        self.hash_algo = hash_algo
+        self.hash_cache: Optional[HashCache] = get_hash_cache() if use_hash_cache else None
         
         # File inventory and duplicate groups
         self.file_inventory: List[FileInfo] = []
-        self.duplicate_map: Dict[str, List[FileInfo]] = {}
-        self.name_map: Dict[str, List[FileInfo]] = {}
-        self.similarity_groups: Dict[str, List[FileInfo]] = {}
+        self.duplicate_map: Dict[str, List[FileInfo]] = defaultdict(list)
+        self.name_map: Dict[str, List[FileInfo]] = defaultdict(list)
+        self.pdf_name_map: Dict[str, List[FileInfo]] = defaultdict(list)
+        self.size_map: Dict[int, List[FileInfo]] = defaultdict(list)
+        self.similarity_groups: Dict[str, List[FileInfo]] = defaultdict(list)
+        
+        # Number of files process_files() hashes in full; set before its first yield
+        self.candidate_count = 0
     
     def inventory_files(self) -> None:
         """
         Create an inventory of all files in the base directory (and subdirectories if enabled).
         """
         self.file_inventory = []
+        self.name_map = defaultdict(list)
+        self.pdf_name_map = defaultdict(list)
+        self.size_map = defaultdict(list)
+        self.duplicate_map = defaultdict(list)
+        self.similarity_groups = defaultdict(list)
         
-        for root, _, files in os.walk(self.base_directory):
-            # Skip subdirectories if not included
-            if not self.include_subdirs and root != self.base_directory:
-                continue
+        # Directories on the same level are listed concurrently so several
+        # getdents/stat requests are in flight at once; results are merged in
+        # submission order to keep the inventory deterministic
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+            level = [self.base_directory]
+            while level:
+                next_level = []
+                for file_infos, subdirs in executor.map(self._scan_directory, level):
+                    for file_info in file_infos:
+                        self._add_to_inventory(file_info)
+                    
+                    # Skip subdirectories if not included
+                    if self.include_subdirs:
+                        next_level.extend(subdirs)
+                level = next_level
+    
+    def _scan_directory(self, directory: str) -> Tuple[List[FileInfo], List[str]]:
+        """
+        List one directory with scandir so file type and stat data come from the DirEntry.
+        
+        Args:
+            directory: Directory to list
+            
+        Returns:
+            Tuple of (files in the directory, paths of its subdirectories)
+        """
+        file_infos = []
+        subdirs = []
+        
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            # Skip directories that can't be listed (missing, denied, I/O errors, symlink loops)
+            return file_infos, subdirs
+        
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
                 
-            for file_name in files:
-                file_path = os.path.join(root, file_name)
+                if not entry.is_file(follow_symlinks=False):
+                    continue
                 
                 # Skip if file doesn't have one of the specified extensions
-                if self.file_extensions:
-                    ext = os.path.splitext(file_name)[1].lower()
-                    if ext not in self.file_extensions:
-                        continue
-                
-                try:
-                    # Get file stats
-                    file_stat = os.stat(file_path)
-                    
-                    # Create FileInfo object
-                    file_info = FileInfo(
-                        path=file_path,
-                        name=file_name,
-                        size=file_stat.st_size,
-                        modified=datetime.fromtimestamp(file_stat.st_mtime),
-                        content_hash=None
-                    )
-                    
-                    self.file_inventory.append(file_info)
-                    
-                    # Add to name map for tracking files with identical names
-                    if file_name not in self.name_map:
-                        self.name_map[file_name] = []
-                    self.name_map[file_name].append(file_info)
-                    
-                except (FileNotFoundError, PermissionError) as e:
-                    # Skip files that can't be accessed
+                ext = file_extension(entry.name)
+                if self.file_extensions is not None and ext not in self.file_extensions:
                     continue
+                
+                # Get file stats
+                file_stat = entry.stat(follow_symlinks=False)
+                
+                # Create FileInfo object
+                file_infos.append(FileInfo(
+                    path=entry.path,
+                    name=entry.name,
+                    size=file_stat.st_size,
+                    modified=datetime.fromtimestamp(file_stat.st_mtime),
+                    content_hash=None,
+                    ext=ext
+                ))
+                
+            except OSError:
+                # Skip files that can't be accessed
+                continue
+        
+        return file_infos, subdirs
+    
+    def _add_to_inventory(self, file_info: FileInfo) -> None:
+        """
+        Add a file to the inventory and the name and size maps.
+        
+        Args:
+            file_info: File to add
+        """
+        self.file_inventory.append(file_info)
+        
+        # Add to name map for tracking files with identical names
+        self.name_map[file_info.name].append(file_info)
+        
+        # PDFs are also tracked separately for the similarity pass
+        if file_info.ext == '.pdf':
+            self.pdf_name_map[file_info.name].append(file_info)
+        
+        # Add to size map; only files sharing a size can be duplicates
+        self.size_map[file_info.size].append(file_info)
     
     def process_files(self) -> Generator[Tuple[FileInfo, str], None, None]:
         """
         Process all files in the inventory - calculate hashes and find duplicates.
+        Only files that share their size with another file are hashed; for files
+        larger than FAST_HASH_BYTES the leading bytes are compared first, and only
+        files whose samples collide are hashed in full. Hashing runs on a thread
+        pool since file reads and the hash functions release the GIL.
         Yields file info and hash for each processed file.
         """
-        for file_info in self.file_inventory:
-            # Calculate content hash
-            try:
-                file_hash = self._calculate_file_hash(file_info.path)
-                file_info.content_hash = file_hash
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+            candidates = []
+            sampled = []
+            
+            for size, bucket in self.size_map.items():
+                # A file with a unique size cannot have a duplicate
+                if len(bucket) < 2:
+                    continue
                 
+                # Small files are fully covered by a single hash
+                if size > FAST_HASH_BYTES:
+                    sampled.extend(bucket)
+                else:
+                    candidates.extend(bucket)
+            
+            candidates.extend(self._filter_by_fast_hash(sampled, executor))
+            self.candidate_count = len(candidates)
+            
+            for file_info, file_hash in self._hash_files(candidates, executor):
                 # Add to duplicate map
-                if file_hash not in self.duplicate_map:
-                    self.duplicate_map[file_hash] = []
+                file_info.content_hash = file_hash
                 self.duplicate_map[file_hash].append(file_info)
                 
                 yield file_info, file_hash
-            
-            except (FileNotFoundError, PermissionError, IOError):
-                # Skip files that can't be accessed
-                continue
+        
+        if self.hash_cache is not None:
+            self.hash_cache.commit()
         
         # After all files are processed, find PDF similarity groups
         self._group_similar_pdfs()
     
-    def _calculate_file_hash(self, file_path: str) -> str:
+    def _filter_by_fast_hash(self, files: List[FileInfo], executor: ThreadPoolExecutor) -> List[FileInfo]:
         """
-        Calculate MD5 hash for a file.
+        Keep only the files whose size and leading bytes match another file's.
         
         Args:
-            file_path: Path to the file
+            files: Files from size buckets with more than one entry
+            executor: Pool to hash on
             
         Returns:
-            String representation of the file's hash
+            Files that may still be duplicates
+        """
+        fast_map: Dict[Tuple[int, str], List[FileInfo]] = defaultdict(list)
+        
+        for file_info, fast_hash in self._hash_files(files, executor, max_bytes=FAST_HASH_BYTES):
+            key = (file_info.size, fast_hash)
+            fast_map[key].append(file_info)
+        
+        return [f for group in fast_map.values() if len(group) > 1 for f in group]
+    
+    def _hash_files(self, files: List[FileInfo], executor: ThreadPoolExecutor,
+                    max_bytes: Optional[int] = None) -> Generator[Tuple[FileInfo, str], None, None]:
+        """
+        Hash files on the pool in batches, yielding results in input order.
+        Files that can't be accessed are skipped.
+        
+        Args:
+            files: Files to hash
+            executor: Pool to hash on
+            max_bytes: Only hash this many leading bytes, None for the whole file
         """
-        # Use buffer to efficiently hash large files
-        buffer_size = 65536  # 64kb chunks
-        md5_hash = hashlib.md5()
+        # Small enough batches that every worker still gets a share
+        batch_size = max(1, min(HASH_BATCH_SIZE, -(-len(files) // HASH_WORKERS)))
+        batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
         
-        with open(file_path, 'rb') as f:
-            while True:
-                data = f.read(buffer_size)
-                if not data:
-                    break
-                md5_hash.update(data)
+        def hash_batch(batch):
+            return compute_hashes([file_info.path for file_info in batch],
+                                  max_bytes, self.hash_cache, self.hash_algo)
         
-        return md5_hash.hexdigest()
+        for batch, hashes in zip(batches, executor.map(hash_batch, batches)):
+            for file_info, file_hash in zip(batch, hashes):
+                if file_hash is not None:
+                    yield file_info, file_hash
+    
+    def _calculate_file_hash(self, file_path: str, max_bytes: Optional[int] = None) -> str:
+        """
+        Calculate a content hash for a file, using the scanner's hash cache.
+        
+        Args:
+            file_path: Path to the file
+            max_bytes: Only hash this many leading bytes, None for the whole file
+            
+        Returns:
+            String representation of the file's hash
+        """
+        return compute_hash(file_path, max_bytes, self.hash_cache, self.hash_algo)
     
     def _group_similar_pdfs(self) -> None:
         """
         Group PDF files that have similar content but different hashes.
         Uses the similarity threshold to determine if two PDFs are similar.
         """
-        # Find all PDF files
-        pdf_files = [f for f in self.file_inventory 
-                     if f.path.lower().endswith('.pdf')]
-        
         # Skip if no PDFs
-        if not pdf_files:
+        if not self.pdf_name_map:
             return
         
+        # ids of the files in each similarity group, for constant-time membership tests
+        group_members: Dict[str, Set[int]] = defaultdict(set)
+        
         # Group PDFs by name first to reduce comparison space
-        for name, files in self.name_map.items():
-            if not name.lower().endswith('.pdf') or len(files) <= 1:
+        for name, files in self.pdf_name_map.items():
+            if len(files) <= 1:
                 continue
-                
-            # Compare each pair of PDFs with the same name
-            for i in range(len(files)):
-                for j in range(i + 1, len(files)):
-                    # Skip if they have the same hash (exact duplicates)
-                    if files[i].content_hash == files[j].content_hash:
-                        continue
-                    
-                    # Calculate similarity
+            
+            if len(files) == 2:
+                # A lone pair is compared directly, streaming the second PDF page
+                # by page so it is abandoned once the threshold is out of reach
+                try:
+                    similarity = calculate_pdf_similarity(files[0].path, files[1].path,
+                                                          self.similarity_threshold)
+                except Exception:
+                    # Skip PDFs that can't be read
+                    continue
+                readable = files
+                pairs = [(0, 1)] if similarity >= self.similarity_threshold else []
+            else:
+                # Extract each PDF's tokens once rather than once per pair
+                readable = []
+                token_sets = []
+                for file_info in files:
                     try:
-                        similarity = calculate_pdf_similarity(files[i].path, files[j].path)
-                        
-                        # If similarity exceeds threshold, group them
-                        if similarity >= self.similarity_threshold:
-                            # Create or assign similarity group
-                            group_id = files[i].similarity_group or files[j].similarity_group or f"sim_{hash(name)}_{i}_{j}"
-                            files[i].similarity_group = group_id
-                            files[j].similarity_group = group_id
-                            
-                            # Add to similarity groups
-                            if group_id not in self.similarity_groups:
-                                self.similarity_groups[group_id] = []
-                            
-                            if files[i] not in self.similarity_groups[group_id]:
-                                self.similarity_groups[group_id].append(files[i])
-                            if files[j] not in self.similarity_groups[group_id]:
-                                self.similarity_groups[group_id].append(files[j])
+                        token_sets.append(extract_pdf_tokens(file_info.path))
+                        readable.append(file_info)
                     except Exception:
-                        # Skip on error during PDF comparison
+                        # Skip PDFs that can't be read
                         continue
+                
+                # 64-bit SimHash fingerprints let most pairs be ruled out without set operations
+                for file_info, tokens in zip(readable, token_sets):
+                    file_info.fingerprint = simhash(tokens)
+                fingerprints = [file_info.fingerprint for file_info in readable]
+                pairs = find_similar_pairs(token_sets, self.similarity_threshold, fingerprints)
+            
+            for i, j in pairs:
+                file_i, file_j = readable[i], readable[j]
+                
+                # Skip if they have the same hash (exact duplicates); files
+                # with a unique size are never hashed
+                if file_i.content_hash and file_i.content_hash == file_j.content_hash:
+                    continue
+                
+                # Create or assign similarity group
+                group_id = file_i.similarity_group or file_j.similarity_group or f"sim_{hash(name)}_{i}_{j}"
+                file_i.similarity_group = group_id
+                file_j.similarity_group = group_id
+                
+                # Add to similarity groups
+                for file_info in (file_i, file_j):
+                    if id(file_info) not in group_members[group_id]:
+                        group_members[group_id].add(id(file_info))
+                        self.similarity_groups[group_id].append(file_info)
+    
+    def remove_file(self, file_path: str) -> None:
+        """
+        Remove a file from the inventory and from every grouping it belongs to.
+        Used after a file is deleted so results can be updated without rescanning.
+        
+        Args:
+            file_path: Path of the removed file
+        """
+        file_info = next((f for f in self.file_inventory if f.path == file_path), None)
+        if file_info is None:
+            return
+        
+        self.file_inventory.remove(file_info)
+        
+        for mapping, key in ((self.name_map, file_info.name),
+                             (self.pdf_name_map, file_info.name),
+                             (self.size_map, file_info.size),
+                             (self.duplicate_map, file_info.content_hash),
+                             (self.similarity_groups, file_info.similarity_group)):
+            files = mapping.get(key)
+            if files and file_info in files:
+                files.remove(file_info)
+                if not files:
+                    del mapping[key]
     
     def get_duplicate_groups(self) -> Dict[str, List[FileInfo]]:
         """
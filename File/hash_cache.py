@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "duplifinder", "hashes.db")
+
+class HashCache:
+    """Persistent store of file hashes keyed by (device, inode, mtime, size)"""
+    
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, commit_every: int = 500):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            db_path: Location of the SQLite database file
+            commit_every: Number of inserts to batch before committing
+        """
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        
+        self.db_path = db_path
+        self.commit_every = commit_every
+        self._pending = 0
+        self._lock = threading.Lock()
+        
+        # Scans and the file monitor hash from worker threads
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "dev INTEGER, ino INTEGER, mtime_ns INTEGER, size INTEGER, scheme TEXT, "
+            "hash TEXT NOT NULL, "
+            "PRIMARY KEY (dev, ino, mtime_ns, size, scheme))"
+        )
+        self._conn.commit()
+    
+    def get(self, file_stat: os.stat_result, scheme: str) -> Optional[str]:
+        """
+        Look up the cached hash for a file.
+        
+        Args:
+            file_stat: Current stat result of the file
+            scheme: Identifier of the hashing scheme that produced the hash
+        
+        Returns:
+            Cached hash, or None if the file is unknown or has changed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT hash FROM hashes WHERE dev=? AND ino=? AND mtime_ns=? AND size=? AND scheme=?",
+                (file_stat.st_dev, file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size, scheme)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def put(self, file_stat: os.stat_result, scheme: str, file_hash: str) -> None:
+        """
+        Store the hash for a file, committing in batches.
+        
+        Args:
+            file_stat: Stat result taken before the file was hashed
+            scheme: Identifier of the hashing scheme that produced the hash
+            file_hash: Hash to store
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                (file_stat.st_dev, file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size, scheme, file_hash)
+            )
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._conn.commit()
+                self._pending = 0
+    
+    def commit(self) -> None:
+        """Flush pending inserts to disk"""
+        with self._lock:
+            if self._pending:
+                self._conn.commit()
+                self._pending = 0
+    
+    def close(self) -> None:
+        """Commit and close the database"""
+        self.commit()
+        with self._lock:
+            self._conn.close()
+
+_shared_cache: Optional[HashCache] = None
+_shared_cache_lock = threading.Lock()
+
+def get_hash_cache() -> Optional[HashCache]:
+    """
+    Get the process-wide hash cache, opening it on first use.
+    
+    Returns:
+        Shared HashCache, or None if the cache location is not writable
+    """
+    global _shared_cache
+    
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = HashCache()
+            except (OSError, sqlite3.Error):
+                return None
+        return _shared_cache
@@ -1,85 +1,222 @@
-from typing import List, Set  # ✅ This was missing!
+from typing import List, Set, FrozenSet, Tuple, Optional, Iterator  # ✅ This was missing!
+import os
 import hashlib
-import re
-def calculate_pdf_similarity(file1_path: str, file2_path: str) -> float:
-    """Calculate similarity between PDF files"""
-    try:
-        return _calculate_similarity_pypdf2(file1_path, file2_path)
-    except:
-        try:
-            return _calculate_similarity_pdfminer(file1_path, file2_path)
-        except:
-            return _calculate_similarity_hash_based(file1_path, file2_path)
+import string
+import functools
+import math
+import numpy as np
 
-def _calculate_similarity_pypdf2(file1_path: str, file2_path: str) -> float:
-    """Calculate similarity using PyPDF2"""
-    from PyPDF2 import PdfReader
+# Token sets from the hash-based fallback are prefixed so they never match words
+_BLOCK_PREFIX = "#block:"
+
+# Deletes ASCII punctuation; "_" is kept since it is a word character
+_PUNCT = str.maketrans('', '', string.punctuation.replace('_', ''))
+
+# Below this many documents, comparing every pair is cheaper than building an LSH index
+LSH_MIN_DOCS = 16
+
+# Width of the SimHash fingerprints used to prefilter pairs
+SIMHASH_BITS = 64
+
+# Extracted texts kept in memory; each entry holds a whole PDF's text
+TEXT_CACHE_SIZE = 64
+
+def calculate_pdf_similarity(file1_path: str, file2_path: str, threshold: float = 0.0) -> float:
+    """
+    Calculate similarity between PDF files.
+    With a threshold, the second file is read page by page and 0.0 is
+    returned as soon as the threshold can no longer be reached.
+    """
+    text1 = _get_text(file1_path)
+    if text1 is None:
+        return _calculate_similarity_hash_based(file1_path, file2_path)
     
-    text1 = _extract_text_pypdf2(file1_path)
-    text2 = _extract_text_pypdf2(file2_path)
+    if threshold > 0:
+        try:
+            return _streamed_similarity(set(_tokenize_text(text1)), file2_path, threshold)
+        except Exception:
+            pass
     
+    text2 = _get_text(file2_path)
+    if text2 is None:
+        return _calculate_similarity_hash_based(file1_path, file2_path)
     return _jaccard_similarity(text1, text2)
 
+def _streamed_similarity(tokens1: Set[str], file2_path: str, threshold: float) -> float:
+    """Jaccard similarity against a PDF read one page at a time, aborting early"""
+    if not tokens1:
+        return 0.0
+    
+    # Words of file 2 missing from file 1 only ever grow the union, so once
+    # len(tokens1) / union drops below the threshold no later page can help
+    max_union = len(tokens1) / threshold
+    seen = set()
+    intersection = 0
+    union = len(tokens1)
+    
+    for page_tokens in _iter_page_tokens(file2_path):
+        new_tokens = page_tokens - seen
+        seen |= new_tokens
+        shared = len(new_tokens & tokens1)
+        intersection += shared
+        union += len(new_tokens) - shared
+        if union > max_union:
+            return 0.0
+    
+    return intersection / union if seen else 0.0
+
+def _get_text(file_path: str) -> Optional[str]:
+    """Extract PDF text, reusing earlier extractions of an unchanged file"""
+    return _extract_text(file_path, os.stat(file_path).st_mtime_ns)
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _extract_text(file_path: str, mtime_ns: int) -> Optional[str]:
+    """Extract PDF text with the first backend that works, None if none do"""
+    try:
+        return _extract_text_pypdf2(file_path)
+    except Exception:
+        try:
+            from pdfminer.high_level import extract_text
+            return extract_text(file_path)
+        except Exception:
+            return None
+
 def _extract_text_pypdf2(file_path: str) -> str:
     """Extract text using PyPDF2"""
+    return "".join(_iter_pages_pypdf2(file_path))
+
+def _iter_pages_pypdf2(file_path: str) -> Iterator[str]:
+    """Yield the text of each page using PyPDF2, reading pages lazily"""
     from PyPDF2 import PdfReader
     
-    text = ""
     with open(file_path, 'rb') as file:
         reader = PdfReader(file)
         for page in reader.pages:
-            text += page.extract_text()
-    return text
+            yield page.extract_text()
 
-def _calculate_similarity_pdfminer(file1_path: str, file2_path: str) -> float:
-    """Calculate similarity using pdfminer"""
-    from pdfminer.high_level import extract_text
-    
-    text1 = extract_text(file1_path)
-    text2 = extract_text(file2_path)
-    
-    return _jaccard_similarity(text1, text2)
+def _iter_page_tokens(file_path: str) -> Iterator[Set[str]]:
+    """Yield the set of words on each page"""
+    for page_text in _iter_pages_pypdf2(file_path):
+        yield set(_tokenize_text(page_text))
 
 def _calculate_similarity_hash_based(file1_path: str, file2_path: str) -> float:
     """Hash-based similarity as fallback"""
-    import hashlib
+    return _jaccard_sets(_get_file_blocks(file1_path), _get_file_blocks(file2_path))
+
+def _get_file_blocks(path: str) -> Set[str]:
+    """Hash a file in 4 KiB blocks"""
+    blocks = set()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(4096)
+            if not chunk:
+                break
+            blocks.add(hashlib.md5(chunk).hexdigest())
+    return blocks
+
+def extract_pdf_tokens(file_path: str) -> FrozenSet[str]:
+    """Extract the words of a PDF once, falling back to content block hashes"""
+    text = _get_text(file_path)
+    if text is None:
+        return frozenset(_BLOCK_PREFIX + block for block in _get_file_blocks(file_path))
+    return frozenset(_tokenize_text(text))
+
+def simhash(tokens: FrozenSet[str]) -> int:
+    """
+    Reduce a token set to a 64-bit SimHash fingerprint.
+    Similar sets get fingerprints that differ in few bits.
+    """
+    if not tokens:
+        return 0
     
-    def get_file_blocks(path):
-        blocks = set()
-        with open(path, 'rb') as f:
-            while True:
-                chunk = f.read(4096)
-                if not chunk:
-                    break
-                blocks.add(hashlib.md5(chunk).hexdigest())
-        return blocks
+    # One stable 64-bit hash per token, unpacked into a (tokens x bits) matrix
+    digests = b"".join(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+                       for token in tokens)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(-1, SIMHASH_BITS)
     
-    blocks1 = get_file_blocks(file1_path)
-    blocks2 = get_file_blocks(file2_path)
+    # A fingerprint bit is set when most tokens have it set
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(tokens)
+    return int.from_bytes(np.packbits(majority).tobytes(), 'big')
+
+def max_hamming_distance(threshold: float) -> int:
+    """
+    Largest fingerprint distance at which two sets may still reach the threshold.
+    Jaccard similarity never exceeds cosine similarity, and SimHash bits differ
+    with probability angle / pi, so allow the expected distance plus three
+    standard deviations.
+    """
+    if threshold >= 1.0:
+        return 0
+    if threshold <= 0.0:
+        return SIMHASH_BITS
     
-    if not blocks1 or not blocks2:
-        return 0.0
+    p = math.acos(threshold) / math.pi
+    slack = 3 * math.sqrt(SIMHASH_BITS * p * (1 - p))
+    return min(SIMHASH_BITS, math.ceil(SIMHASH_BITS * p + slack))
+
+def find_similar_pairs(token_sets: List[FrozenSet[str]], threshold: float,
+                       fingerprints: Optional[List[int]] = None) -> List[Tuple[int, int]]:
+    """
+    Find index pairs of token sets whose Jaccard similarity reaches the threshold.
+    SimHash fingerprints, computed when not given, rule out most pairs with
+    one XOR and popcount before any set is compared.
+    """
+    if fingerprints is None:
+        fingerprints = [simhash(tokens) for tokens in token_sets]
+    
+    return [(i, j) for i, j in _candidate_pairs(token_sets, threshold, fingerprints)
+            if _jaccard_sets(token_sets[i], token_sets[j], threshold) >= threshold]
+
+def _candidate_pairs(token_sets: List[FrozenSet[str]], threshold: float,
+                     fingerprints: List[int]) -> List[Tuple[int, int]]:
+    """Pairs worth an exact comparison; uses MinHash LSH for large inputs when available"""
+    n = len(token_sets)
+    lsh = None
+    if n >= LSH_MIN_DOCS:
+        try:
+            from datasketch import MinHash, MinHashLSH
+            lsh = MinHashLSH(threshold=threshold, num_perm=128)
+        except ImportError:
+            pass
+        except ValueError:
+            # Thresholds near 1.0 leave too few bands for LSH; the fingerprint
+            # filter below is exact there anyway
+            pass
     
-    intersection = len(blocks1.intersection(blocks2))
-    union = len(blocks1.union(blocks2))
+    if lsh is None:
+        max_distance = max_hamming_distance(threshold)
+        return [(i, j) for i in range(n) for j in range(i + 1, n)
+                if (fingerprints[i] ^ fingerprints[j]).bit_count() <= max_distance]
     
-    return intersection / union if union > 0 else 0.0
+    minhashes = []
+    for i, tokens in enumerate(token_sets):
+        minhash = MinHash(num_perm=128)
+        minhash.update_batch(token.encode('utf-8') for token in tokens)
+        lsh.insert(i, minhash)
+        minhashes.append(minhash)
+    
+    return sorted({(i, j) for i in range(n) for j in lsh.query(minhashes[i]) if i < j})
 
 def _jaccard_similarity(text1: str, text2: str) -> float:
     """Calculate Jaccard similarity between texts"""
-    words1 = set(_tokenize_text(text1))
-    words2 = set(_tokenize_text(text2))
-    
-    if not words1 or not words2:
+    return _jaccard_sets(set(_tokenize_text(text1)), set(_tokenize_text(text2)))
+
+def _jaccard_sets(set1: Set[str], set2: Set[str], threshold: float = 0.0) -> float:
+    """
+    Calculate Jaccard similarity between token sets.
+    Returns 0.0 early when the size ratio already rules out reaching the threshold.
+    """
+    len1, len2 = len(set1), len(set2)
+    if not len1 or not len2:
         return 0.0
     
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
+    # |A & B| <= min(|A|, |B|) and |A | B| >= max(|A|, |B|)
+    if min(len1, len2) / max(len1, len2) < threshold:
+        return 0.0
     
-    return intersection / union if union > 0 else 0.0
+    intersection = len(set1 & set2)
+    return intersection / (len1 + len2 - intersection)
 
 def _tokenize_text(text: str) -> List[str]:
     """Clean and tokenize text"""
-    import re
-    text = re.sub(r'[^\w\s]', '', text.lower())
-    return text.split()
\ No newline at end of file
+    return text.translate(_PUNCT).lower().split()
\ No newline at end of file
@@ -1,12 +1,25 @@
 import os
 import shutil
-import hashlib
+import filecmp
+import math
+import functools
+from itertools import repeat
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from typing import List, Dict, Tuple, Any, Optional
-from pathlib import Path
+import numpy as np
 import pandas as pd
 import humanize
 from datetime import datetime
+from file_scanner import HASH_FACTORIES, compute_hash
 
+# BLAKE3 when installed, otherwise SHA-256, which OpenSSL runs on the CPU's SHA extensions
+DEFAULT_HASH_ALGORITHM = 'blake3' if 'blake3' in HASH_FACTORIES else 'sha256'
+
+# Content comparison needs no cryptographic strength, so prefer the much faster xxh3
+COMPARE_HASH_ALGORITHM = 'xxh3' if 'xxh3' in HASH_FACTORIES else DEFAULT_HASH_ALGORITHM
+
+@functools.lru_cache(maxsize=8192)
 def format_file_size(size_bytes: int) -> str:
     """
     Format file size in a human-readable format.
@@ -29,8 +42,15 @@ def format_timestamp(timestamp: float) -> str:
     Returns:
         Formatted date/time string
     """
-    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+    # The format has one-second resolution, so whole seconds make a good cache key
+    return _format_seconds(math.floor(timestamp))
 
+@functools.lru_cache(maxsize=4096)
+def _format_seconds(seconds: int) -> str:
+    """Format a whole-second Unix timestamp"""
+    return datetime.fromtimestamp(seconds).strftime('%Y-%m-%d %H:%M:%S')
+
+@functools.lru_cache(maxsize=65536)
 def get_file_extension(file_path: str) -> str:
     """
     Get the file extension from a path.
@@ -41,62 +61,161 @@ def get_file_extension(file_path: str) -> str:
     Returns:
         File extension (lowercase, with dot)
     """
-    return os.path.splitext(file_path)[1].lower()
+    dot = file_path.rfind('.')
+    sep = file_path.rfind(os.sep)
+    if os.altsep:
+        sep = max(sep, file_path.rfind(os.altsep))
+    
+    # Like splitext, dots leading the file name (hidden files) don't start an extension
+    if dot > sep and file_path[sep + 1:dot].strip('.'):
+        return file_path[dot:].lower()
+    return ''
 
-def is_same_file(file1_path: str, file2_path: str) -> bool:
+def is_same_file(file1_path: str, file2_path: str, use_hash: bool = False) -> bool:
     """
     Check if two files are the same based on content.
     
     Args:
         file1_path: Path to the first file
         file2_path: Path to the second file
+        use_hash: Compare memoized hashes instead of the bytes; better when the
+            same file is checked against many others
         
     Returns:
         True if files have identical content, False otherwise
     """
-    if not os.path.exists(file1_path) or not os.path.exists(file2_path):
+    # One stat per file covers both the existence and the size check
+    try:
+        stat1 = os.stat(file1_path)
+        stat2 = os.stat(file2_path)
+    except OSError:
         return False
     
     # Fast check: if sizes differ, files are different
-    if os.path.getsize(file1_path) != os.path.getsize(file2_path):
+    if stat1.st_size != stat2.st_size:
+        return False
+    
+    # Files that differ in their first or last page need no full hash
+    if not _quick_bytes_equal(file1_path, file2_path):
         return False
     
+    # A direct compare stops at the first differing block and reads each file at most once
+    if not use_hash:
+        return filecmp.cmp(file1_path, file2_path, shallow=False)
+    
     # Compare hashes
-    hash1 = calculate_file_hash(file1_path)
-    hash2 = calculate_file_hash(file2_path)
+    hash1 = calculate_file_hash(file1_path, COMPARE_HASH_ALGORITHM)
+    hash2 = calculate_file_hash(file2_path, COMPARE_HASH_ALGORITHM)
     
     return hash1 == hash2
 
-def calculate_file_hash(file_path: str, algorithm: str = 'md5') -> str:
+def _quick_bytes_equal(file1_path: str, file2_path: str, n: int = 4096) -> bool:
+    """
+    Compare the first and last n bytes of two files of equal size.
+    
+    Args:
+        file1_path: Path to the first file
+        file2_path: Path to the second file
+        n: Number of bytes to sample at each end
+        
+    Returns:
+        False if the samples differ, True if the files may be identical
+    """
+    with open(file1_path, 'rb') as f1, open(file2_path, 'rb') as f2:
+        if f1.read(n) != f2.read(n):
+            return False
+        
+        # Only files longer than the head sample have a separate tail
+        if os.fstat(f1.fileno()).st_size > n:
+            f1.seek(-n, os.SEEK_END)
+            f2.seek(-n, os.SEEK_END)
+            return f1.read(n) == f2.read(n)
+    
+    return True
+
+def calculate_file_hash(file_path: str, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
     """
     Calculate hash for a file.
     
     Args:
         file_path: Path to the file
-        algorithm: Hash algorithm to use
+        algorithm: Hash algorithm to use, one of file_scanner.HASH_ALGORITHMS
         
     Returns:
         Hexadecimal hash string
     """
-    if algorithm.lower() == 'md5':
-        hash_obj = hashlib.md5()
-    elif algorithm.lower() == 'sha1':
-        hash_obj = hashlib.sha1()
-    elif algorithm.lower() == 'sha256':
-        hash_obj = hashlib.sha256()
-    else:
-        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    # Stat once; a changed file gets a new key, so stale hashes are never returned
+    file_stat = os.stat(file_path)
+    return _cached_file_hash(file_path, file_stat.st_mtime_ns, file_stat.st_size, algorithm.lower())
+
+@functools.lru_cache(maxsize=100_000)
+def _cached_file_hash(file_path: str, mtime_ns: int, size: int, algorithm: str) -> str:
+    """Hash a file, memoized on its path, modification time, size and algorithm"""
+    return compute_hash(file_path, hash_algo=algorithm)
+
+def calculate_file_hashes(file_paths: List[str], workers: Optional[int] = None,
+                          algorithm: str = DEFAULT_HASH_ALGORITHM,
+                          use_processes: bool = False) -> List[Optional[str]]:
+    """
+    Calculate hashes for many files in parallel.
+    Threads suit most scans since hashing releases the GIL and small files are
+    I/O-bound; processes only pay off for very large CPU-bound batches and
+    don't share the in-memory hash cache.
+    
+    Args:
+        file_paths: Paths of the files to hash
+        workers: Number of workers, defaults to the CPU count
+        algorithm: Hash algorithm to use
+        use_processes: Hash in a process pool instead of a thread pool
+        
+    Returns:
+        Hashes in input order, None for files that couldn't be read
+    """
+    workers = workers or os.cpu_count() or 1
     
-    buffer_size = 65536  # 64kb chunks
+    if use_processes:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_hash_or_none, file_paths, repeat(algorithm), chunksize=16))
     
-    with open(file_path, 'rb') as f:
-        while True:
-            data = f.read(buffer_size)
-            if not data:
-                break
-            hash_obj.update(data)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_hash_or_none, file_paths, repeat(algorithm)))
+
+def _hash_or_none(file_path: str, algorithm: str) -> Optional[str]:
+    """Hash a file, returning None if it can't be read"""
+    try:
+        return calculate_file_hash(file_path, algorithm)
+    except OSError:
+        return None
+
+def group_by_size_then_hash(file_paths: List[str],
+                            algorithm: str = DEFAULT_HASH_ALGORITHM) -> Dict[str, List[str]]:
+    """
+    Group identical files, hashing only files that share their size with another.
     
-    return hash_obj.hexdigest()
+    Args:
+        file_paths: Paths of the files to group
+        algorithm: Hash algorithm to use
+        
+    Returns:
+        Dictionary mapping each hash to the paths of two or more identical files
+    """
+    size_buckets = defaultdict(list)
+    for file_path in file_paths:
+        try:
+            size_buckets[os.stat(file_path).st_size].append(file_path)
+        except OSError:
+            # Skip files that can't be accessed
+            continue
+    
+    # A file with a unique size cannot have a duplicate
+    candidates = [path for bucket in size_buckets.values() if len(bucket) > 1 for path in bucket]
+    
+    hash_groups = defaultdict(list)
+    for file_path, file_hash in zip(candidates, calculate_file_hashes(candidates, algorithm=algorithm)):
+        if file_hash is not None:
+            hash_groups[file_hash].append(file_path)
+    
+    return {file_hash: paths for file_hash, paths in hash_groups.items() if len(paths) > 1}
 
 def get_common_directory(file_paths: List[str]) -> str:
     """
@@ -108,20 +227,15 @@ def get_common_directory(file_paths: List[str]) -> str:
     Returns:
         Common parent directory path
     """
-    if not file_paths:
-        return ""
-    
-    # Convert to Path objects
-    paths = [Path(p) for p in file_paths]
-    
-    # Get common parent
-    common_parent = os.path.commonpath([str(p) for p in paths])
-    
-    return common_parent
+    return os.path.commonpath(file_paths) if file_paths else ""
+
+# Shared result for successful operations, so success allocates nothing
+_OK = (True, None)
 
 def safe_file_operation(operation_fn, *args, **kwargs) -> Tuple[bool, Optional[str]]:
     """
     Safely execute a file operation with error handling.
+    Only OS errors are caught; other exceptions indicate bugs and propagate.
     
     Args:
         operation_fn: Function to execute
@@ -132,8 +246,8 @@ def safe_file_operation(operation_fn, *args, **kwargs) -> Tuple[bool, Optional[s
     """
     try:
         operation_fn(*args, **kwargs)
-        return True, None
-    except Exception as e:
+        return _OK
+    except OSError as e:
         return False, str(e)
 
 def create_duplicate_summary(duplicate_groups: Dict[str, List[Any]]) -> pd.DataFrame:
@@ -146,21 +260,30 @@ def create_duplicate_summary(duplicate_groups: Dict[str, List[Any]]) -> pd.DataF
     Returns:
         Pandas DataFrame with summary information
     """
-    summary_data = []
+    # One long-form row per file, aggregated per group in a single columnar pass
+    rows = [(group_id, f.size, f.path)
+            for group_id, files in duplicate_groups.items() if len(files) > 1
+            for f in files]
+    if not rows:
+        return pd.DataFrame()
     
-    for group_id, files in duplicate_groups.items():
-        if len(files) <= 1:
-            continue
-            
-        group_size = sum(f.size for f in files)
-        waste_size = sum(f.size for f in files[1:])  # All but the first file
-        
-        summary_data.append({
-            'Group ID': group_id[:8],
-            'Files': len(files),
-            'Total Size': format_file_size(group_size),
-            'Wasted Space': format_file_size(waste_size),
-            'File Type': get_file_extension(files[0].path) if files else ''
-        })
-    
-    return pd.DataFrame(summary_data)
+    files_df = pd.DataFrame(rows, columns=['group_id', 'size', 'path'])
+    groups = files_df.groupby('group_id', sort=False).agg(
+        total=('size', 'sum'),
+        count=('size', 'size'),
+        first_size=('size', 'first'),
+        first_path=('path', 'first')
+    )
+    waste = groups['total'] - groups['first_size']  # All but the first file
+    
+    # Format each distinct byte count once; duplicate groups often share sizes
+    unique_sizes = pd.unique(np.concatenate((groups['total'].to_numpy(), waste.to_numpy()))).tolist()
+    size_labels = dict(zip(unique_sizes, map(format_file_size, unique_sizes)))
+    
+    return pd.DataFrame({
+        'Group ID': groups.index.str[:8],
+        'Files': groups['count'].to_numpy(),
+        'Total Size': groups['total'].map(size_labels).to_numpy(),
+        'Wasted Space': waste.map(size_labels).to_numpy(),
+        'File Type': groups['first_path'].map(get_file_extension).to_numpy()
+    })